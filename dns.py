@@ -1,9 +1,18 @@
 import streamlit as st
-import pandas as pd
-from domain_research_crew import DomainResearchCrew
+from domain_research_crew import DomainResearchCrew, DomainResearchRequest
+from domain_tools import LookupFailed, has_lookup_error, uncached_on_error
+from typing import List, Tuple
 import plotly.express as px
 from datetime import datetime
 import time
+import csv
+import io
+import logging
+import jinja2
+import pyarrow as pa
+import pyarrow.feather as feather
+
+log = logging.getLogger(__name__)
 
 # Set page config
 st.set_page_config(
@@ -27,18 +36,111 @@ st.markdown("""
         padding: 20px;
         border-radius: 10px;
     }
+    .name-grid {
+        display: grid;
+        grid-template-columns: repeat(2, 1fr);
+        gap: 16px;
+        margin-bottom: 16px;
+    }
     </style>
     """, unsafe_allow_html=True)
 
+@st.cache_data(ttl=3600, show_spinner=False)
+def _cached_process(_crew: DomainResearchCrew, request_key: str, selected: Tuple[str, ...]):
+    request = DomainResearchRequest.model_validate_json(request_key)
+    results = _crew.process_domain_request(request, list(selected))
+    if any(has_lookup_error(r.availability) or has_lookup_error(r.similar_companies)
+           for r in results['research_results']):
+        raise LookupFailed(results)
+    return results
+
+def cached_process(crew: DomainResearchCrew, request_key: str, selected: Tuple[str, ...]):
+    """Memoize crew runs per request and selection, skipping runs with failed lookups"""
+    return uncached_on_error(_cached_process, crew, request_key, selected)
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def cached_names(_crew: DomainResearchCrew, request_key: str) -> List[str]:
+    """Memoize name generation per request across reruns"""
+    return _crew.generate_names(DomainResearchRequest.model_validate_json(request_key))
+
+@st.cache_resource
+def _get_crew() -> DomainResearchCrew:
+    return DomainResearchCrew()
+
+# Card markup is compiled once and rendered for all names in a single pass
+_NAME_CARDS_TPL = jinja2.Template("""
+<div class="name-grid">
+{% for name in names %}
+    <div class="highlight">
+        <h4>{{ name }}</h4>
+        <p style="color: gray; font-size: 14px;">Length: {{ name|length }} characters</p>
+    </div>
+{% endfor %}
+</div>
+""", autoescape=True, trim_blocks=True, lstrip_blocks=True)
+
+_AVAILABLE_CARDS_TPL = jinja2.Template("""
+{% for domain in domains %}
+<div class="highlight">
+    <h4>{{ domain }}</h4>
+    <p style="color: green;">✓ Available</p>
+</div>
+{% endfor %}
+""", autoescape=True, trim_blocks=True, lstrip_blocks=True)
+
+_RESULTS_SCHEMA = pa.schema([
+    ('domain', pa.string()),
+    ('available', pa.bool_()),
+    ('analysis', pa.string()),
+    ('similar_companies', pa.string())
+])
+
+def _results_to_feather(results) -> bytes:
+    """Serialize analysis results once to Feather bytes for session state"""
+    available = set(results['available_domains'])
+    market_research = results['market_research']
+    domains = list(dict.fromkeys([*results['available_domains'], *market_research]))
+    similar_companies = {
+        r.domain_name: "\n\n".join(c['description'] for c in r.similar_companies if c.get('description'))
+        for r in results['research_results']
+    }
+    table = pa.table({
+        'domain': domains,
+        'available': [domain in available for domain in domains],
+        'analysis': [market_research[domain]['raw_analysis'] if domain in market_research else None
+                     for domain in domains],
+        'similar_companies': [similar_companies.get(domain) or None for domain in domains]
+    }, schema=_RESULTS_SCHEMA)
+    buf = pa.BufferOutputStream()
+    feather.write_feather(table, buf)
+    return bytes(buf.getvalue())
+
+def _read_results(results_bytes: bytes) -> pa.Table:
+    """Read the Feather-encoded analysis results back into a table"""
+    return feather.read_table(pa.BufferReader(results_bytes))
+
+@st.fragment
+def _name_picker(names):
+    """Name selection widgets, rerun on their own when the selection changes"""
+    st.session_state.selected_names = set(st.multiselect("Select names", names))
+    
+    st.markdown("---")
+    st.markdown("### Selected Names")
+    st.markdown(", ".join(sorted(st.session_state.selected_names)) if st.session_state.selected_names else "No names selected yet")
+    
+    if len(st.session_state.selected_names) >= 2 and st.button("Proceed with Analysis", type="primary"):
+        st.session_state.analysis_requested = True
+        st.rerun()
+
 class DomainResearchUI:
     def __init__(self):
-        self.crew = DomainResearchCrew()
+        self.crew = _get_crew()
         if 'stage' not in st.session_state:
             st.session_state.stage = 'input'
         if 'selected_names' not in st.session_state:
-            st.session_state.selected_names = []
-        if 'final_results' not in st.session_state:
-            st.session_state.final_results = None
+            st.session_state.selected_names = set()
+        if 'results_bytes' not in st.session_state:
+            st.session_state.results_bytes = None
 
     def render_header(self):
         col1, col2, col3 = st.columns([1, 2, 1])
@@ -86,93 +188,93 @@ class DomainResearchUI:
                 
             if st.button("Generate Names", type="primary"):
                 with st.spinner("Generating domain suggestions..."):
-                    initial_results = self.crew.process_domain_request(
-                        f"{domain_type} in {industry} industry"
+                    request = DomainResearchRequest(
+                        domain_type=domain_type,
+                        industry=industry,
+                        max_length=max_length,
+                        include_numbers=include_numbers
                     )
-                    print("initial results are " + str(initial_results))
-                    st.session_state.initial_names = initial_results['initial_names']
+                    st.session_state.request_key = request.model_dump_json()
+                    try:
+                        initial_names = cached_names(self.crew, st.session_state.request_key)
+                    except ValueError as e:
+                        st.error(f"Could not generate domain suggestions, please try again. ({e})")
+                        return
+                    log.debug("initial results are %s", initial_names)
+                    st.session_state.initial_names = initial_names
                     st.session_state.stage = 'selection'
 
     def render_selection_stage(self):
         st.markdown("### Select Your Preferred Names")
         
         if 'initial_names' in st.session_state:
-            cols = st.columns(2)
+            names = st.session_state.initial_names
+            st.markdown(_NAME_CARDS_TPL.render(names=names), unsafe_allow_html=True)
             
-            for idx, name in enumerate(st.session_state.initial_names):
-                with cols[idx % 2]:
-                    st.markdown(f"""
-                    <div class="highlight">
-                        <h4>{name}</h4>
-                        <p style="color: gray; font-size: 14px;">Length: {len(name)} characters</p>
-                    </div>
-                    """, unsafe_allow_html=True)
-                    
-                    if st.checkbox(f"Select {name}", key=f"select_{name}"):
-                        if name not in st.session_state.selected_names:
-                            st.session_state.selected_names.append(name)
+            _name_picker(names)
             
-            st.markdown("---")
-            st.markdown("### Selected Names")
-            st.markdown(", ".join(st.session_state.selected_names) if st.session_state.selected_names else "No names selected yet")
-            
-            if len(st.session_state.selected_names) >= 2 and st.button("Proceed with Analysis", type="primary"):
+            if st.session_state.pop('analysis_requested', False):
                 with st.spinner("Analyzing selected domains..."):
-                    final_results = self.crew.process_domain_request(
-                        "domain analysis",
-                        st.session_state.selected_names
+                    final_results = cached_process(
+                        self.crew,
+                        st.session_state.request_key,
+                        tuple(sorted(st.session_state.selected_names))
                     )
-                    st.session_state.final_results = final_results
+                    st.session_state.results_bytes = _results_to_feather(final_results)
                     st.session_state.stage = 'analysis'
 
     def render_analysis_stage(self):
-        if not st.session_state.final_results:
+        if not st.session_state.results_bytes:
             st.error("No analysis results available")
             return
 
+        results = _read_results(st.session_state.results_bytes)
+        domains = results['domain'].to_pylist()
+        analyses = results['analysis'].to_pylist()
+        available_domains = [d for d, available in zip(domains, results['available'].to_pylist()) if available]
+        market_research = {d: analysis for d, analysis in zip(domains, analyses) if analysis is not None}
+        similar_companies = dict(zip(domains, results['similar_companies'].to_pylist()))
+
         st.markdown("### Analysis Results")
         
         # Available Domains Section
         st.subheader("🌐 Available Domains")
-        available_domains = st.session_state.final_results['available_domains']
         if available_domains:
-            for domain in available_domains:
-                st.markdown(f"""
-                <div class="highlight">
-                    <h4>{domain}</h4>
-                    <p style="color: green;">✓ Available</p>
-                </div>
-                """, unsafe_allow_html=True)
+            st.markdown(_AVAILABLE_CARDS_TPL.render(domains=available_domains), unsafe_allow_html=True)
         else:
             st.warning("No available domains found")
 
         # Market Research Section
         st.subheader("📊 Market Research")
-        for domain, research in st.session_state.final_results['market_research'].items():
+        for domain, analysis in market_research.items():
             with st.expander(f"Research for {domain}"):
-                st.markdown(research['raw_analysis'])
+                st.markdown(analysis)
+                if similar_companies.get(domain):
+                    st.markdown("**Similar companies**")
+                    st.markdown(similar_companies[domain])
 
         # Action Buttons
         col1, col2 = st.columns(2)
         with col1:
             if st.button("Start Over"):
                 st.session_state.clear()
-                st.experimental_rerun()
+                st.rerun()
         with col2:
             if st.button("Export Results"):
                 # Create timestamp for filename
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                # Convert results to DataFrame
-                results_df = pd.DataFrame({
-                    'Domain': available_domains,
-                    'Status': ['Available'] * len(available_domains),
-                    'Research': [st.session_state.final_results['market_research'].get(domain, {}).get('raw_analysis', '') 
-                               for domain in available_domains]
-                })
+                # Write results straight to an in-memory CSV buffer
+                buf = io.StringIO()
+                writer = csv.writer(buf)
+                writer.writerow(['Domain', 'Status', 'Research'])
+                writer.writerows(
+                    (domain, 'Available', market_research.get(domain, ''))
+                    for domain in available_domains
+                )
                 # Create download button
                 st.download_button(
                     label="Download CSV",
-                    data=results_df.to_csv(index=False),
+                    data=buf.getvalue().encode(),
                     file_name=f'domain_research_{timestamp}.csv',
                     mime='text/csv'
                 )
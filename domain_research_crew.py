@@ -5,12 +5,18 @@ from typing import List, Dict, Optional
 from datetime import datetime
 from domain_tools import DomainTools
 from typing import List, Dict
+import asyncio
+import logging
 import numpy as np
+import orjson
 import random
 import string
 import requests
+import streamlit as st
 import os
 
+log = logging.getLogger(__name__)
+
 class DomainResearchRequest(BaseModel):
     """Domain research request parameters"""
     domain_type: str
@@ -22,87 +28,41 @@ class DomainResearchResult(BaseModel):
     """Domain research comprehensive results"""
     domain_name: str
     availability: Dict
-    variations: List[str]
+    variations: List[Dict]
     similar_companies: List[Dict]
     estimated_value: Dict
     trademark_conflicts: List[Dict]
     timestamp: datetime
 
-class DomainResearchCrew:
-    def __init__(self):
-        self.tools = DomainTools().get_tools()
-        self.setup_agents()
-
-    def setup_agents(self):
-        """Initialize specialized agents for domain research"""
-        
-        # Domain Generator Agent (removed duplicate name_agent)
-        self.name_generator = Agent(
-            role='Domain Name Generator',
-            goal='Generate creative and relevant domain names based on user requirements',
-            backstory="""You are an expert in creating memorable domain names. 
-            You understand naming conventions, branding, and what makes a domain name effective.
-            You consider industry trends and best practices when generating names.""",
-            tools=[],
-            verbose=True
-        )
-        
-        # Availability Agent
-        self.availability_agent = Agent(
-            role='Availability Checker',
-            goal='Check domain availability and estimate value',
-            backstory="""You are an expert in domain availability and valuation.
-            You analyze domain status and potential worth.""",
-            tools=[self.tools[0], self.tools[3]],  # check_availability and estimate_value tools
-            verbose=True
-        )
-
-        # Research Agent
-        self.research_agent = Agent(
-            role='Market Researcher',
-            goal='Research market context and potential conflicts',
-            backstory="""You are an expert in market research and trademark analysis.
-            You identify similar companies and potential conflicts.""",
-            tools=[self.tools[2], self.tools[4]],  # research_companies and check_trademark tools
-            verbose=True
-        )
-
-    def create_tasks(self, request: DomainResearchRequest) -> List[Task]:
-        """Create all tasks with proper dependencies and expected outputs"""
-        
-        # Task 1: Generate Names
-        name_generation_task = Task(
-            description=f"""Generate creative domain names based on the following criteria:
-            - Industry: {request.industry or 'Not specified'}
-            - Type: {request.domain_type}
-            - Maximum length: {request.max_length}
-            - Include numbers: {request.include_numbers}
+# Task prompts are defined once at module level; str.format_map fills in the
+# per-request fields.
+_NAME_DESCRIPTION_TPL = """Generate creative domain names based on the following criteria:
+            - Industry: {industry}
+            - Type: {domain_type}
+            - Maximum length: {max_length}
+            - Include numbers: {include_numbers}
             
             Generate at least 10 unique names that are:
             - Memorable and brandable
             - Relevant to the industry and type
             - Available as .ai domains
             - Following modern naming trends
-            """,
-            expected_output="""A JSON array of objects, each containing:
+            """
+
+_NAME_EXPECTED_OUTPUT = """A JSON array of objects, each containing:
             {
                 "domain_name": "suggested name with .ai",
                 "rationale": "explanation of why this name fits the criteria",
                 "industry_relevance": "how it relates to the industry"
             }
-            Return exactly 10 domain suggestions.""",
-            agent=self.name_generator
-        )
+            Return exactly 10 domain suggestions."""
 
-        # Task 2: Check Availability and Value
-        availability_task = Task(
-            description="""For each generated domain name:
-            1. Check domain availability
+_AVAILABILITY_DESCRIPTION_TPL = """For the domain {domain_name}:
+            1. Review its availability, already checked in bulk: {availability}
             2. Estimate potential value
-            3. Provide pricing information
-            
-            Focus on domains with highest potential value and availability.""",
-            expected_output="""A JSON array of objects, each containing:
+            3. Provide pricing information"""
+
+_AVAILABILITY_EXPECTED_OUTPUT = """A JSON object containing:
             {
                 "domain_name": "analyzed domain with the suffix of .ai",
                 "availability": {
@@ -118,21 +78,17 @@ class DomainResearchCrew:
                         "memorable": "score out of 10"
                     }
                 }
-            }""",
-            agent=self.availability_agent,
-            dependencies=[name_generation_task]
-        )
+            }"""
 
-        # Task 3: Market Research
-        market_research_task = Task(
-            description="""For the most promising available domains:
-            1. Research similar companies
+_RESEARCH_DESCRIPTION_TPL = """For the domain {domain_name}:
+            1. Review similar companies, already researched: {similar_companies}
             2. Check trademark conflicts
             3. Analyze competitive landscape
             4. Assess brand potential
             
-            Provide detailed findings and risk assessment.""",
-            expected_output="""A JSON array of objects, each containing:
+            Provide detailed findings and risk assessment."""
+
+_RESEARCH_EXPECTED_OUTPUT = """A JSON object containing:
             {
                 "domain_name": "researched domain with the .ai suffix",
                 "availability": {
@@ -158,60 +114,192 @@ class DomainResearchCrew:
                     "brand_potential": "score out of 10",
                     "recommendations": "specific recommendations"
                 }
-            }""",
-            agent=self.research_agent,
-            dependencies=[availability_task]
+            }"""
+
+@st.cache_resource
+def _get_domain_tools() -> DomainTools:
+    return DomainTools()
+
+@st.cache_resource
+def _get_tools() -> List:
+    return _get_domain_tools().get_tools()
+
+class DomainResearchCrew:
+    def __init__(self):
+        self.domain_tools = _get_domain_tools()
+        self.tools = _get_tools()
+        self.setup_agents()
+
+    def setup_agents(self):
+        """Initialize specialized agents for domain research"""
+        
+        # Domain Generator Agent (removed duplicate name_agent)
+        self.name_generator = Agent(
+            role='Domain Name Generator',
+            goal='Generate creative and relevant domain names based on user requirements',
+            backstory="""You are an expert in creating memorable domain names. 
+            You understand naming conventions, branding, and what makes a domain name effective.
+            You consider industry trends and best practices when generating names.""",
+            tools=[],
+            verbose=True
+        )
+        
+        # Availability Agent
+        self.availability_agent = Agent(
+            role='Availability Checker',
+            goal='Check domain availability and estimate value',
+            backstory="""You are an expert in domain availability and valuation.
+            You analyze domain status and potential worth.""",
+            tools=[self.tools[0], self.tools[3]],  # check_availability and estimate_value tools
+            verbose=True
+        )
+
+        # Research Agent
+        self.research_agent = Agent(
+            role='Market Researcher',
+            goal='Research market context and potential conflicts',
+            backstory="""You are an expert in market research and trademark analysis.
+            You identify similar companies and potential conflicts.""",
+            tools=[self.tools[2], self.tools[4]],  # research_companies and check_trademark tools
+            verbose=True
         )
 
-        return [name_generation_task, availability_task, market_research_task]
+    def create_tasks(self, request: DomainResearchRequest, name_generator: Optional[Agent] = None) -> List[Task]:
+        """Create the name generation task"""
+        
+        # Task 1: Generate Names
+        name_generation_task = Task(
+            description=_NAME_DESCRIPTION_TPL.format_map({
+                **request.model_dump(),
+                'industry': request.industry or 'Not specified'
+            }),
+            expected_output=_NAME_EXPECTED_OUTPUT,
+            agent=name_generator or self.name_generator
+        )
 
-    def process_domain_request(
+        return [name_generation_task]
+
+    def create_domain_tasks(
         self,
-        request: DomainResearchRequest
-    ) -> Dict[str, List[DomainResearchResult]]:
-        """Process a complete domain research request with a single crew"""
+        domain_name: str,
+        availability: Dict,
+        similar_companies: List[Dict],
+        availability_agent: Agent,
+        research_agent: Agent
+    ) -> List[Task]:
+        """Create the availability and research tasks for a single domain"""
         
-        # Create all tasks with dependencies
-        tasks = self.create_tasks(request)
-        
-        # Create single crew with all agents
+        # Task 2: Check Availability and Value
+        availability_task = Task(
+            description=_AVAILABILITY_DESCRIPTION_TPL.format_map({
+                'domain_name': domain_name,
+                'availability': orjson.dumps(availability).decode()
+            }),
+            expected_output=_AVAILABILITY_EXPECTED_OUTPUT,
+            agent=availability_agent
+        )
+
+        # Task 3: Market Research
+        market_research_task = Task(
+            description=_RESEARCH_DESCRIPTION_TPL.format_map({
+                'domain_name': domain_name,
+                'similar_companies': orjson.dumps(similar_companies).decode()
+            }),
+            expected_output=_RESEARCH_EXPECTED_OUTPUT,
+            agent=research_agent,
+            dependencies=[availability_task]
+        )
+
+        return [availability_task, market_research_task]
+
+    def generate_names(self, request: DomainResearchRequest) -> List[str]:
+        """Run the name generator and return the suggested domain names"""
+        # The crew instance is shared across sessions, so run a private copy of the agent
+        name_generator = self.name_generator.copy()
         crew = Crew(
-            agents=[self.name_generator, self.availability_agent, self.research_agent],
-            tasks=tasks,
+            agents=[name_generator],
+            tasks=self.create_tasks(request, name_generator),
             process=Process.sequential,
             verbose=True
         )
+        output = str(crew.kickoff())
+        
+        # The agent may wrap the JSON array in prose or code fences
+        try:
+            suggestions = orjson.loads(output[output.index('['):output.rindex(']') + 1])
+            return [s['domain_name'] for s in suggestions]
+        except (ValueError, KeyError, TypeError) as e:
+            raise ValueError(f"Could not parse domain suggestions from the name generator: {e}") from e
+
+    async def analyze_domains(self, domain_data: List[Dict]) -> List:
+        """Run one availability + research crew per domain concurrently"""
+        crews = []
+        for data in domain_data:
+            # Each crew gets its own agents so concurrent runs don't share executor state
+            availability_agent = self.availability_agent.copy()
+            research_agent = self.research_agent.copy()
+            crews.append(Crew(
+                agents=[availability_agent, research_agent],
+                tasks=self.create_domain_tasks(
+                    data['domain_name'], data['availability'], data['similar_companies'],
+                    availability_agent, research_agent
+                ),
+                process=Process.sequential,
+                verbose=True
+            ))
+        return await asyncio.gather(*[crew.kickoff_async() for crew in crews])
+
+    def process_domain_request(
+        self,
+        request: DomainResearchRequest,
+        selected_names: Optional[List[str]] = None
+    ) -> Dict:
+        """Process a complete domain research request, analyzing domains concurrently"""
         
-        # Execute all tasks
-        results = crew.kickoff()
+        names = selected_names or self.generate_names(request)
+        
+        # Run all tools for the domains concurrently, with one bulk availability check
+        domain_data = self.domain_tools.collect_domain_data(names)
+        
+        # Execute the per-domain crews concurrently
+        results = asyncio.run(self.analyze_domains(domain_data))
         
         # Process the results
-        processed_results = self.process_results(results)
+        processed_results = self.process_results(results, domain_data)
         
         return processed_results
 
-    def process_results(self, crew_results: str):
-        """Process the crew results into structured format"""
+    def process_results(self, crew_results: List, domain_data: List[Dict]) -> Dict:
+        """Process the crew results into structured format
+        
+        Returns the keys the Streamlit UI reads: initial_names, available_domains
+        and market_research ({domain: {"raw_analysis": ...}}), plus the
+        structured research_results.
+        """
         research_results = []
         
-        print(crew_results)
-        # names = crew_results.get('generated_names', [])
-        # for name in names[:5]:  # Limit to top 5 names
-        #     result = DomainResearchResult(
-        #         domain_name=name,
-        #         availability=self.tools[0](name),  # check_availability
-        #         variations=self.tools[1](name),    # generate_variations
-        #         similar_companies=self.tools[2](name),  # research_companies
-        #         estimated_value=self.tools[3](name),    # estimate_value
-        #         trademark_conflicts=self.tools[4](name), # check_trademark
-        #         timestamp=datetime.now()
-        #     )
-        #     research_results.append(result)
+        log.debug("crew results are %s", crew_results)
+        for data in domain_data:
+            result = DomainResearchResult(
+                domain_name=data['domain_name'],
+                availability=data['availability'],
+                variations=data['variations'],
+                similar_companies=data['similar_companies'],
+                estimated_value=data['estimated_value'],
+                trademark_conflicts=data['trademark_conflicts'],
+                timestamp=datetime.now()
+            )
+            research_results.append(result)
         
-        # return {
-        #     "initial_names": names,
-        #     "research_results": research_results
-        # }
+        return {
+            "initial_names": [data['domain_name'] for data in domain_data],
+            "available_domains": [r.domain_name for r in research_results if r.availability['available']],
+            "market_research": {
+                data['domain_name']: {"raw_analysis": str(output)}
+                for data, output in zip(domain_data, crew_results)
+            },
+            "research_results": research_results
+        }
 
     def filter_results(
         self,
@@ -220,15 +308,15 @@ class DomainResearchCrew:
         must_be_available: bool = True
     ) -> List[DomainResearchResult]:
         """Filter research results based on criteria"""
-        filtered = results.copy()
+        filtered = iter(results)
         
         if must_be_available:
-            filtered = [r for r in filtered if r.availability['available']]
+            filtered = (r for r in filtered if r.availability['available'])
             
         if min_value:
-            filtered = [r for r in filtered if r.estimated_value['estimated_value'] >= min_value]
+            filtered = (r for r in filtered if r.estimated_value['estimated_value'] >= min_value)
             
-        return filtered
+        return list(filtered)
 
 # Example usage
 def main():
@@ -242,8 +330,11 @@ def main():
         include_numbers=False
     )
     
-    # Process the request
-    results = crew.process_domain_request(request)
+    # Process the request, then release the HTTP session and disk cache
+    try:
+        results = crew.process_domain_request(request)
+    finally:
+        crew.domain_tools.close()
     
     # # Filter results
     # filtered_results = crew.filter_results(
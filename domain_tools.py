@@ -1,12 +1,75 @@
 from typing import List, Dict, Optional
-from langchain.tools import BaseTool, StructuredTool, Tool
+from langchain.tools import BaseTool, StructuredTool, Tool, DuckDuckGoSearchRun
+from duckduckgo_search.exceptions import RatelimitException
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
 from pydantic import BaseModel, Field
-import requests
 from dotenv import load_dotenv
+import asyncio
+from itertools import chain
+import threading
+import aiohttp
+import diskcache
+import numpy as np
+import orjson
+import streamlit as st
 import os
 
 load_dotenv()
 
+# GoDaddy's bulk availability endpoint accepts at most this many domains per call
+_BULK_LIMIT = 500
+
+def _default_cache_dir() -> str:
+    """Per-user cache directory, since diskcache entries are pickled"""
+    cache_dir = os.getenv('DOMAIN_CACHE_DIR') or os.path.join(
+        os.getenv('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'),
+        'domaingenerator'
+    )
+    os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+    return cache_dir
+
+def _normalize_domain(domain_name: str) -> str:
+    return domain_name.strip().lower().rstrip('.')
+
+class LookupFailed(Exception):
+    """Raised inside cached wrappers so failed lookups are not memoized"""
+    def __init__(self, result):
+        super().__init__(result)
+        self.result = result
+
+def has_lookup_error(result) -> bool:
+    """Whether a tool result (a dict or a list of dicts) carries an error"""
+    if isinstance(result, dict):
+        return 'error' in result
+    return any('error' in r for r in result)
+
+def _raise_on_error(result):
+    if has_lookup_error(result):
+        raise LookupFailed(result)
+    return result
+
+def uncached_on_error(cached_func, *args):
+    """Call a cached lookup, handing back failed results without caching them"""
+    try:
+        return cached_func(*args)
+    except LookupFailed as e:
+        return e.result
+
+# Lookup results are a pure function of the domain, so memoize them across
+# Streamlit reruns. The leading underscore keeps the tools instance out of the
+# cache key.
+@st.cache_data(ttl=3600, show_spinner=False)
+def _check_availability(_tools: "DomainTools", domain_name: str) -> Dict:
+    return _raise_on_error(_tools._run(_tools.check_domain_availability(domain_name)))
+
+@st.cache_data(ttl=86400, show_spinner=False)
+def _research_companies(_tools: "DomainTools", domain_name: str) -> List[Dict]:
+    return _raise_on_error(_tools._run(_tools.research_similar_companies(domain_name)))
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _check_trademarks(_tools: "DomainTools", domain_name: str) -> List[Dict]:
+    return _raise_on_error(_tools._run(_tools.check_trademark_conflicts(domain_name)))
+
 class DomainTools:
     def __init__(self):
         self.godaddy_api_key = os.getenv('GODADDY_API_KEY')
@@ -15,6 +78,43 @@ class DomainTools:
             'Authorization': f'sso-key {self.godaddy_api_key}:{self.godaddy_api_secret}',
             'Content-Type': 'application/json'
         }
+        # Tools are invoked synchronously by crewAI, so the async lookups run
+        # on a dedicated background loop that also owns the shared session.
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(target=self._loop.run_forever, daemon=True).start()
+        self._session = None
+        self.search = DuckDuckGoSearchRun()
+        # DuckDuckGo rate limits aggressively, so cap concurrent searches
+        self._search_semaphore = asyncio.Semaphore(2)
+        # Lookup results outlive the Streamlit process and are shared between sessions
+        self.cache = diskcache.Cache(_default_cache_dir())
+        self.cache_ttl = 3600
+        self.research_cache_ttl = 86400
+
+    def _run(self, coro):
+        """Run a coroutine on the background loop and wait for its result"""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared HTTP session, creating it on first use"""
+        if self._session is None:
+            # Keep TLS connections alive so repeat lookups skip the handshake
+            connector = aiohttp.TCPConnector(limit=20, keepalive_timeout=60, ttl_dns_cache=300)
+            self._session = aiohttp.ClientSession(headers=self.api_headers, connector=connector)
+        return self._session
+
+    def _cache_get(self, tool: str, domain_name: str):
+        return self.cache.get((tool, domain_name))
+
+    def _cache_set(self, tool: str, domain_name: str, result, expire: Optional[int] = None):
+        self.cache.set((tool, domain_name), result, expire=expire or self.cache_ttl)
+
+    def close(self):
+        """Close the shared HTTP session and the on-disk cache"""
+        if self._session is not None:
+            self._run(self._session.close())
+            self._session = None
+        self.cache.close()
 
     def get_tools(self) -> List[Tool]:
         """Return list of tools compatible with crewAI"""
@@ -22,7 +122,7 @@ class DomainTools:
         tools = [
             Tool(
                 name="check_domain_availability",
-                func=self.check_domain_availability,
+                func=lambda domain_name: uncached_on_error(_check_availability, self, domain_name),
                 description="""Check if a domain name is available for registration.
                 Input should be a domain name without extension.
                 Returns availability status and pricing information."""
@@ -38,7 +138,7 @@ class DomainTools:
             
             Tool(
                 name="research_similar_companies",
-                func=self.research_similar_companies,
+                func=lambda domain_name: uncached_on_error(_research_companies, self, domain_name),
                 description="""Research companies with similar names or in similar business domains.
                 Input should be a domain name or company name.
                 Returns information about similar companies."""
@@ -54,7 +154,7 @@ class DomainTools:
             
             Tool(
                 name="check_trademark_conflicts",
-                func=self.check_trademark_conflicts,
+                func=lambda domain_name: uncached_on_error(_check_trademarks, self, domain_name),
                 description="""Check for potential trademark conflicts for a domain name.
                 Input should be a domain name.
                 Returns list of potential trademark conflicts."""
@@ -63,20 +163,27 @@ class DomainTools:
         
         return tools
 
-    def check_domain_availability(self, domain_name: str) -> Dict:
+    async def check_domain_availability(self, domain_name: str) -> Dict:
         """Check domain availability using GoDaddy API"""
+        cached = self._cache_get('availability', domain_name)
+        if cached is not None:
+            return cached
+        
         url = f'https://api.godaddy.com/v1/domains/available?domain={domain_name}'
         
         try:
-            response = requests.get(url, headers=self.api_headers)
-            data = response.json()
+            async with self._get_session().get(url) as response:
+                response.raise_for_status()
+                data = orjson.loads(await response.read())
             
-            return {
+            result = {
                 'domain': domain_name,
                 'available': data.get('available', False),
                 'price': data.get('price'),
                 'currency': data.get('currency', 'USD')
             }
+            self._cache_set('availability', domain_name, result)
+            return result
         except Exception as e:
             return {
                 'domain': domain_name,
@@ -84,41 +191,123 @@ class DomainTools:
                 'error': str(e)
             }
 
+    async def _fetch_bulk(self, batch: List[str]) -> Dict[str, Dict]:
+        """POST one batch to GoDaddy's bulk endpoint, keyed by normalized domain"""
+        url = 'https://api.godaddy.com/v1/domains/available?checkType=FAST'
+        
+        try:
+            async with self._get_session().post(url, data=orjson.dumps(batch)) as response:
+                response.raise_for_status()
+                data = orjson.loads(await response.read())
+            
+            results = {}
+            for d in data.get('domains', []):
+                results[_normalize_domain(d['domain'])] = {
+                    'domain': d['domain'],
+                    'available': d.get('available', False),
+                    'price': d.get('price'),
+                    'currency': d.get('currency', 'USD')
+                }
+            for err in data.get('errors', []):
+                results[_normalize_domain(err['domain'])] = {
+                    'domain': err['domain'],
+                    'available': False,
+                    'error': err.get('message')
+                }
+            return results
+        except Exception as e:
+            return {
+                _normalize_domain(domain_name): {
+                    'domain': domain_name,
+                    'available': False,
+                    'error': str(e)
+                }
+                for domain_name in batch
+            }
+
+    async def check_domains_bulk(self, domains: List[str]) -> Dict[str, Dict]:
+        """Check availability of many domains, up to 500 per GoDaddy API call"""
+        results = {}
+        missing = []
+        for domain_name in domains:
+            cached = self._cache_get('availability', domain_name)
+            if cached is None:
+                missing.append(domain_name)
+            else:
+                results[domain_name] = cached
+        if not missing:
+            return results
+        
+        batches = [missing[i:i + _BULK_LIMIT] for i in range(0, len(missing), _BULK_LIMIT)]
+        fetched = {}
+        for batch_results in await asyncio.gather(*[self._fetch_bulk(batch) for batch in batches]):
+            fetched.update(batch_results)
+        
+        # Map results back to the caller's spelling of each domain
+        for domain_name in missing:
+            result = fetched.get(_normalize_domain(domain_name))
+            if result is None:
+                result = {
+                    'domain': domain_name,
+                    'available': False,
+                    'error': 'Domain missing from bulk availability response'
+                }
+            else:
+                result = {**result, 'domain': domain_name}
+                if 'error' not in result:
+                    self._cache_set('availability', domain_name, result)
+            results[domain_name] = result
+        return results
+
     def generate_domain_variations(self, base_name: str) -> List[Dict]:
         """Generate domain name variations"""
-        variations = []
         prefixes = ['get', 'try', 'use', 'my', 'the']
         suffixes = ['app', 'io', 'co', 'net', 'org']
         
-        for prefix in prefixes:
-            name = f"{prefix}{base_name}"
-            if len(name) <= 63:
-                variations.append({
-                    'name': name.lower(),
-                    'type': 'prefix',
-                    'score': 0.8
-                })
-        
-        for suffix in suffixes:
-            name = f"{base_name}{suffix}"
-            if len(name) <= 63:
-                variations.append({
-                    'name': name.lower(),
-                    'type': 'suffix',
-                    'score': 0.9
-                })
-        
-        return variations
-
-    def research_similar_companies(self, domain_name: str) -> List[Dict]:
-        """Research similar companies"""
-        return [{
-            'name': f"Similar{domain_name}",
-            'description': "A similar company in the industry",
-            'website': f"https://similar{domain_name}.com",
-            'industry': "Technology",
-            'founded_year': 2020
-        }]
+        candidates = chain(
+            ((f"{prefix}{base_name}".lower(), 'prefix', 0.8) for prefix in prefixes),
+            ((f"{base_name}{suffix}".lower(), 'suffix', 0.9) for suffix in suffixes)
+        )
+        return [
+            {'name': name, 'type': kind, 'score': score}
+            for name, kind, score in candidates
+            if len(name) <= 63
+        ]
+
+    @retry(
+        wait=wait_exponential(multiplier=1, max=30),
+        retry=retry_if_exception_type(RatelimitException),
+        stop=stop_after_attempt(5),
+        reraise=True
+    )
+    async def _search(self, query: str) -> str:
+        """Run a DuckDuckGo search, backing off when rate limited"""
+        async with self._search_semaphore:
+            return await asyncio.to_thread(self.search.run, query)
+
+    async def research_similar_companies(self, domain_name: str) -> List[Dict]:
+        """Research similar companies using DuckDuckGo"""
+        cached = self._cache_get('research', domain_name)
+        if cached is not None:
+            return cached
+        
+        query = f"companies similar to {domain_name}"
+        
+        try:
+            summary = await self._search(query)
+            
+            result = [{
+                'query': query,
+                'description': summary
+            }]
+            self._cache_set('research', domain_name, result, expire=self.research_cache_ttl)
+            return result
+        except Exception as e:
+            return [{
+                'query': query,
+                'description': '',
+                'error': str(e)
+            }]
 
     def estimate_domain_value(self, domain_name: str) -> Dict:
         """Estimate domain value"""
@@ -141,11 +330,88 @@ class DomainTools:
             'confidence_score': 0.8
         }
 
-    def check_trademark_conflicts(self, domain_name: str) -> List[Dict]:
+    def estimate_domain_values_batch(self, names: List[str]) -> List[Dict]:
+        """Estimate values for many domains in one vectorized pass, matching estimate_domain_value"""
+        if not names:
+            return []
+        
+        arr = np.array(names)
+        lengths = np.char.str_len(arr)
+        # View each name as a row of single characters (padded with '') so the
+        # digit test is str.isdigit per character, as in estimate_domain_value
+        chars = arr.view('<U1').reshape(len(arr), -1)
+        has_numbers = np.char.isdigit(chars).any(axis=1)
+        
+        base_values = np.full(len(arr), 1000.0)
+        base_values[lengths < 6] *= 2
+        base_values[~has_numbers] *= 1.5
+        
+        return [
+            {
+                # The scalar path stays an int unless the 1.5x bonus applies
+                'estimated_value': int(value) if numbers else value,
+                'factors': {
+                    'length': length,
+                    'has_numbers': numbers,
+                    'brandability_score': 7.5
+                },
+                'confidence_score': 0.8
+            }
+            for value, length, numbers in zip(base_values.tolist(), lengths.tolist(), has_numbers.tolist())
+        ]
+
+    async def check_trademark_conflicts(self, domain_name: str) -> List[Dict]:
         """Check trademark conflicts"""
-        return [{
+        cached = self._cache_get('trademark', domain_name)
+        if cached is not None:
+            return cached
+        
+        result = [{
             'trademark': domain_name.upper(),
             'owner': "Sample Company Inc",
             'registration_number': "US123456",
             'risk_level': "LOW"
-        }]
\ No newline at end of file
+        }]
+        self._cache_set('trademark', domain_name, result)
+        return result
+
+    async def _all_tools_for(
+        self,
+        domain_name: str,
+        availability: Dict,
+        estimated_value: Dict,
+        variations: List[Dict]
+    ) -> Dict:
+        """Run every research tool for a single domain concurrently"""
+        similar_companies, trademark_conflicts = await asyncio.gather(
+            self.research_similar_companies(domain_name),
+            self.check_trademark_conflicts(domain_name)
+        )
+        return {
+            'domain_name': domain_name,
+            'availability': availability,
+            'variations': variations,
+            'similar_companies': similar_companies,
+            'estimated_value': estimated_value,
+            'trademark_conflicts': trademark_conflicts
+        }
+
+    async def gather_domain_data(self, domains: List[str]) -> List[Dict]:
+        """Run all research tools for all domains concurrently"""
+        availability = await self.check_domains_bulk(domains)
+        variations = [self.generate_domain_variations(d) for d in domains]
+        
+        # Score the domains and every variation in a single batch
+        all_variations = list(chain.from_iterable(variations))
+        values = self.estimate_domain_values_batch(domains + [v['name'] for v in all_variations])
+        for variation, value in zip(all_variations, values[len(domains):]):
+            variation['estimated_value'] = value['estimated_value']
+        
+        return await asyncio.gather(*[
+            self._all_tools_for(d, availability[d], value, domain_variations)
+            for d, value, domain_variations in zip(domains, values, variations)
+        ])
+
+    def collect_domain_data(self, domains: List[str]) -> List[Dict]:
+        """Synchronous entry point for gather_domain_data"""
+        return self._run(self.gather_domain_data(domains))